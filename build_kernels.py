@@ -0,0 +1,19 @@
+"""
+Ahead-of-time build of the cable selection kernel.
+
+Compiles cable_app's selection kernel into the ``cable_kernels`` extension
+module next to this file, so the app can import it instead of JIT-compiling
+with numba at startup. Requires numba; run with:
+
+    python build_kernels.py
+"""
+
+from numba.pycc import CC
+
+from cable_app import _KERNEL_SIGNATURE, _select_cable_kernel
+
+cc = CC("cable_kernels")
+cc.export("select_cable_core", _KERNEL_SIGNATURE)(_select_cable_kernel)
+
+if __name__ == "__main__":
+    cc.compile()
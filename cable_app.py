@@ -5,9 +5,20 @@ XLPE Armoured Cables
 
 import streamlit as st
 import math
-from fpdf import FPDF
+import numpy as np
 from datetime import datetime
 import io
+from typing import NamedTuple, Optional, Union
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to plain Python
+    njit = None
+
+# Constants used by calculate_current
+_SQRT3 = math.sqrt(3)
+_HP_TO_KW = 0.746
+_VALID_V = frozenset((230, 415))
 
 # Current Rating (Amps) for COPPER cables (Armoured, XLPE insulated)
 COPPER_CURRENT_RATINGS = {
@@ -93,6 +104,93 @@ ALUMINIUM_VOLTAGE_DROP_FACTORS = {
     400: 0.18,
 }
 
+# Conductor type / installation method -> index into the lookup tables below
+_COND = {"Cu": 0, "Al": 1}
+_METHOD = {"ground": 0, "free_air": 1, "pipe_duct": 2}
+
+# Lookup tables built once at import, sizes ascending:
+# _RATINGS[conductor, method, size] and _VD[conductor, size].
+# Ratings are whole amps below 1000, so they are stored as int16. VD factors
+# stay float64: float32 cannot hold values such as 0.30 exactly, which would
+# move selections sitting exactly on the voltage drop limit.
+# Sizes are kept as a tuple so the selected size retains its original
+# key type (e.g. 4 rather than 4.0) for display and dict lookups.
+_SIZES = tuple(sorted(COPPER_CURRENT_RATINGS))
+_RATINGS = np.array([
+    [[ratings[s][m] for s in _SIZES] for m in _METHOD]
+    for ratings in (COPPER_CURRENT_RATINGS, ALUMINIUM_CURRENT_RATINGS)
+], dtype=np.int16)
+_VD = np.array([
+    [factors[s] for s in _SIZES]
+    for factors in (COPPER_VOLTAGE_DROP_FACTORS, ALUMINIUM_VOLTAGE_DROP_FACTORS)
+], dtype=np.float64)
+
+# Kernel signature for the table dtypes above
+_KERNEL_SIGNATURE = (
+    "Tuple((intp, float64, float64, float64))"
+    "(int16[:], float64[:], float64, float64, float64, float64, float64)"
+)
+
+
+def _select_cable_kernel(ratings, vd, current, derate, max_vd_pct, length, voltage):
+    """
+    Find the first size (ascending) meeting both the ampacity and voltage
+    drop criteria.
+
+    Ratings rise and voltage drop factors fall with size, so each criterion
+    holds for a suffix of the sizes: binary search for the start of both
+    and take the later one.
+
+    Returns (index, derated capacity, voltage drop %, voltage drop mV/m),
+    with index -1 if no size qualifies.
+    """
+    n = ratings.shape[0]
+
+    def fits(i):
+        return (ratings[i] * derate >= current
+                and vd[i] * current * length / (voltage * 1000.0) * 100.0 <= max_vd_pct)
+
+    # First size whose derated rating carries the load
+    i_amp = np.searchsorted(ratings, current / derate) if derate > 0.0 else n
+    # First size whose voltage drop factor is within the limit (vd is
+    # descending, so search its ascending reversed view)
+    if current * length > 0.0:
+        max_vd = max_vd_pct * voltage * 1000.0 / (100.0 * current * length)
+        i_vd = n - np.searchsorted(vd[::-1], max_vd, side="right")
+    else:
+        i_vd = 0
+    i = max(i_amp, i_vd)
+
+    # The searches use rearranged inequalities; settle floating point
+    # rounding at the boundary against the exact criteria
+    while i > 0 and fits(i - 1):
+        i -= 1
+    while i < n and not fits(i):
+        i += 1
+    if i == n:
+        return -1, 0.0, 0.0, 0.0
+    vd_percent = vd[i] * current * length / (voltage * 1000.0) * 100.0
+    return i, ratings[i] * derate, vd_percent, vd[i] * current
+
+
+@st.cache_resource
+def _get_select_cable_core():
+    """
+    Resolve the selection kernel once per process: the ahead-of-time build
+    from build_kernels.py if present, else a numba JIT build, else plain Python.
+    """
+    try:
+        from cable_kernels import select_cable_core
+    except ImportError:
+        pass
+    else:
+        return select_cable_core
+    if njit is None:
+        return _select_cable_kernel
+    # An explicit signature compiles (or loads from the on-disk cache) eagerly
+    return njit(_KERNEL_SIGNATURE, cache=True)(_select_cable_kernel)
+
+
 def calculate_current(load_value, load_type, voltage, power_factor):
     """
     Calculate Full Load Current (FLC) in Amps based on load and voltage.
@@ -116,15 +214,13 @@ def calculate_current(load_value, load_type, voltage, power_factor):
     Raises:
     -------
     ValueError
-        If invalid load_type or voltage is provided
+        If invalid load_type, voltage or power_factor is provided
     """
-    import math
-    
     # Validate inputs
     if load_type not in ["kW", "HP", "Amps"]:
         raise ValueError("load_type must be 'kW', 'HP', or 'Amps'")
     
-    if voltage not in [230, 415]:
+    if voltage not in _VALID_V:
         raise ValueError("voltage must be 230V (single-phase) or 415V (three-phase)")
     
     if not 0 < power_factor <= 1:
@@ -136,7 +232,7 @@ def calculate_current(load_value, load_type, voltage, power_factor):
     
     # Convert HP to kW if needed
     if load_type == "HP":
-        load_kw = load_value * 0.746
+        load_kw = load_value * _HP_TO_KW
     else:  # load_type == "kW"
         load_kw = load_value
     
@@ -146,9 +242,18 @@ def calculate_current(load_value, load_type, voltage, power_factor):
         current = (load_kw * 1000) / (voltage * power_factor)
     else:  # voltage == 415
         # Three-phase: I = P / (√3 × V × PF)
-        current = (load_kw * 1000) / (math.sqrt(3) * voltage * power_factor)
+        current = (load_kw * 1000) / (_SQRT3 * voltage * power_factor)
     
-    return round(current, 2)
+    return current
+
+
+class CableResult(NamedTuple):
+    """Outcome of select_cable; numeric fields are None if no cable qualifies."""
+    size: Optional[Union[int, float]]
+    actual_capacity: Optional[float]
+    voltage_drop: Optional[float]
+    voltage_drop_mv: Optional[float]
+    status: str
 
 
 def select_cable(calculated_current, conductor_type, installation_method, length, 
@@ -175,13 +280,13 @@ def select_cable(calculated_current, conductor_type, installation_method, length
     
     Returns:
     --------
-    dict
-        Dictionary containing:
-        - 'size': Selected cable size (mm²)
-        - 'actual_capacity': Derated cable capacity (Amps)
-        - 'voltage_drop': Voltage drop (%)
-        - 'voltage_drop_mv': Voltage drop (mV/m)
-        - 'status': 'Selected' or error message
+    CableResult
+        Named tuple containing:
+        - size: Selected cable size (mm²)
+        - actual_capacity: Derated cable capacity (Amps)
+        - voltage_drop: Voltage drop (%)
+        - voltage_drop_mv: Voltage drop (mV/m)
+        - status: 'Selected' or error message
     
     Raises:
     -------
@@ -189,132 +294,125 @@ def select_cable(calculated_current, conductor_type, installation_method, length
         If invalid conductor_type, installation_method, or no suitable cable found
     """
     
-    # Select appropriate dictionaries
-    if conductor_type.upper() == "CU":
-        current_dict = COPPER_CURRENT_RATINGS
-        vd_dict = COPPER_VOLTAGE_DROP_FACTORS
-    elif conductor_type.upper() == "AL":
-        current_dict = ALUMINIUM_CURRENT_RATINGS
-        vd_dict = ALUMINIUM_VOLTAGE_DROP_FACTORS
-    else:
+    # Resolve table indices (inputs are expected in canonical form)
+    cond_idx = _COND.get(conductor_type)
+    if cond_idx is None:
         raise ValueError("conductor_type must be 'Cu' or 'Al'")
     
-    # Validate installation method
-    if installation_method.lower() not in ["ground", "free_air", "pipe_duct"]:
+    method_idx = _METHOD.get(installation_method)
+    if method_idx is None:
         raise ValueError("installation_method must be 'ground', 'free_air', or 'pipe_duct'")
     
-    # Get the installation method key
-    method_key = installation_method.lower()
-    
-    # Iterate through cable sizes
-    for size in sorted(current_dict.keys()):
-        base_capacity = current_dict[size][method_key]
-        derated_capacity = base_capacity * derating_factor
-        
-        # Check if derated capacity is greater than load current
-        if derated_capacity >= calculated_current:
-            # Calculate voltage drop
-            vd_factor = vd_dict[size]  # mV/A/m
-            voltage_drop_mv = vd_factor * calculated_current * length  # mV
-            voltage_drop_percent = (voltage_drop_mv / (voltage * 1000)) * 100
-            
-            # Check if voltage drop is within acceptable limits
-            if voltage_drop_percent <= max_voltage_drop_percent:
-                return {
-                    'size': size,
-                    'actual_capacity': round(derated_capacity, 2),
-                    'voltage_drop': round(voltage_drop_percent, 2),
-                    'voltage_drop_mv': round(voltage_drop_mv / length, 3),  # mV/m
-                    'status': 'Selected'
-                }
+    # Smallest size whose derated capacity carries the load and whose
+    # voltage drop is within acceptable limits
+    idx, capacity, vd_percent, vd_mv_per_m = _get_select_cable_core()(
+        _RATINGS[cond_idx, method_idx], _VD[cond_idx], float(calculated_current),
+        float(derating_factor), float(max_voltage_drop_percent), float(length), float(voltage)
+    )
+    if idx >= 0:
+        return CableResult(
+            size=_SIZES[idx],
+            actual_capacity=float(capacity),
+            voltage_drop=float(vd_percent),
+            voltage_drop_mv=float(vd_mv_per_m),  # mV/m
+            status='Selected'
+        )
     
     # If no suitable cable found, return error
-    return {
-        'size': None,
-        'actual_capacity': None,
-        'voltage_drop': None,
-        'voltage_drop_mv': None,
-        'status': f'No suitable cable found. Max voltage drop of {max_voltage_drop_percent}% exceeded.'
-    }
-
-
-import streamlit as st
-import pandas as pd
-from fpdf import FPDF
-
-# --- 1. CONFIGURATION & DATA ---
-AL_DATA_3PH = {
-    16: [74, 73, 58], 25: [96, 99, 76], 35: [115, 122, 92],
-    50: [135, 148, 110], 70: [167, 188, 135], 95: [200, 233, 162],
-    120: [228, 271, 185], 150: [258, 311, 210], 185: [295, 362, 240],
-    240: [345, 437, 280], 300: [390, 499, 315], 400: [450, 586, 365]
-}
-
-CU_DATA_3PH = {
-    2.5: [39, 36, 29], 4: [48, 49, 38], 6: [60, 62, 47],
-    10: [77, 85, 63], 16: [100, 115, 82], 25: [130, 148, 105],
-    35: [155, 185, 125], 50: [180, 220, 145], 70: [225, 280, 180],
-    95: [270, 350, 215]
-}
-
-VD_FACTORS_AL = {
-    16: 4.1, 25: 2.5, 35: 1.8, 50: 1.3, 70: 0.9, 95: 0.7,
-    120: 0.55, 150: 0.46, 185: 0.36, 240: 0.28, 300: 0.23, 400: 0.19
-}
-VD_FACTORS_CU = {
-    2.5: 15.0, 4: 9.5, 6: 6.4, 10: 3.8, 16: 2.4, 25: 1.5,
-    35: 1.1, 50: 0.8, 70: 0.55, 95: 0.42
-}
+    return CableResult(
+        size=None,
+        actual_capacity=None,
+        voltage_drop=None,
+        voltage_drop_mv=None,
+        status=f'No suitable cable found. Max voltage drop of {max_voltage_drop_percent}% exceeded.'
+    )
 
-# --- 2. DEFINE FUNCTIONS (MUST BE AT THE TOP) ---
 
+@st.cache_data(max_entries=32)
 def generate_pdf(selected_size, current_load, voltage_drop_percent, load_val, volt_val, cond_type, install_type):
     """Generates the PDF report and returns the binary data."""
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
+    # Imported here so ReportLab only loads when a report is generated
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+    from reportlab.pdfgen import canvas
+    
+    buf = io.BytesIO()
+    pdf = canvas.Canvas(buf, pagesize=A4)
+    page_width, page_height = A4
+    left, right = 10 * mm, page_width - 10 * mm
+    line = 10 * mm
+    y = page_height - 16 * mm
+    pdf.setFont("Helvetica", 12)
     
     # Title
-    pdf.cell(200, 10, txt="Electrical Inspectorate - Cable Selection Report", ln=1, align='C')
-    pdf.cell(200, 10, txt="------------------------------------------------", ln=1, align='C')
+    pdf.drawCentredString(page_width / 2, y, "Electrical Inspectorate - Cable Selection Report")
+    y -= line
+    pdf.drawCentredString(page_width / 2, y, "------------------------------------------------")
+    y -= line
     
     # Body
-    pdf.cell(200, 10, txt=f"Load: {str(load_val)} | Voltage: {str(volt_val)}V", ln=1)
-    pdf.cell(200, 10, txt=f"Calculated Current: {current_load:.2f} Amps", ln=1)
-    pdf.cell(200, 10, txt=f"Cable Material: {cond_type} | Install: {install_type}", ln=1)
-    pdf.ln(5)
+    pdf.drawString(left, y, f"Load: {str(load_val)} | Voltage: {str(volt_val)}V")
+    y -= line
+    pdf.drawString(left, y, f"Calculated Current: {current_load:.2f} Amps")
+    y -= line
+    pdf.drawString(left, y, f"Cable Material: {cond_type} | Install: {install_type}")
+    y -= line + 5 * mm
     
     # Result
-    pdf.set_font("Arial", 'B', size=14)
-    pdf.cell(200, 10, txt=f"Selected Size: {str(selected_size)} sq.mm", ln=1)
-    pdf.set_font("Arial", size=12)
-    pdf.cell(200, 10, txt=f"Voltage Drop: {voltage_drop_percent:.2f}%", ln=1)
+    pdf.setFont("Helvetica-Bold", 14)
+    pdf.drawString(left, y, f"Selected Size: {str(selected_size)} sq.mm")
+    y -= line
+    pdf.setFont("Helvetica", 12)
+    pdf.drawString(left, y, f"Voltage Drop: {voltage_drop_percent:.2f}%")
+    y -= line + 10 * mm
     
     # Footer
-    pdf.ln(10)
-    pdf.cell(200, 10, txt="Standard: IS 7098 Part 1 (XLPE)", ln=1, align='R')
+    pdf.drawRightString(right, y, "Standard: IS 7098 Part 1 (XLPE)")
     
-    return pdf.output(dest='S').encode('latin-1')
-
-# --- 3. PAGE SETUP ---
-st.set_page_config(page_title="BIS Cable Sizer", page_icon="⚡")
-st.title("⚡ IS 7098 Cable Selection Calculator")
-
-# --- 4. INPUTS ---
-st.sidebar.header("1. System Details")
-
+    pdf.showPage()
+    pdf.save()
+    return buf.getvalue()
 
 # ============================================================================
 # STREAMLIT APPLICATION
 # ============================================================================
 
+_HEADER_MD = "**Based on Indian Standards (IS 7098 Part 1) - XLPE Armoured Cables**"
+
+# Sidebar widget options
+_VOLTAGE_OPTS = ("1-Phase (230V)", "3-Phase (415V)")
+_LOAD_TYPE_OPTS = ("kW", "HP", "Amps")
+_CONDUCTOR_OPTS = ("Copper (Cu)", "Aluminium (Al)")
+_METHOD_OPTS = ("Ground", "Free Air", "Pipe/Duct")
+_METHOD_MAP = {"Ground": "ground", "Free Air": "free_air", "Pipe/Duct": "pipe_duct"}
+
+# Display labels for the supported system voltages
+_VOLTAGE_LABEL = {230: "230V", 415: "415V"}
+_PHASE_LABEL = {230: "Single-Phase", 415: "3-Phase"}
+
+# Row labels of the cable specifications table
+_SPEC_PARAMETERS = (
+    "Base Rating (from IS 7098)",
+    "Derating Factor",
+    "Actual Capacity",
+    "Load Current",
+    "Safety Margin",
+    "Voltage Drop",
+    "Voltage Drop (mV/m)",
+)
+
+
 def main():
     """Main Streamlit application for Cable Sizing."""
     
     # Page configuration
     st.set_page_config(page_title="Cable Sizer - IS 7098", layout="wide")
     st.title("⚡ Electrical Cable Sizing Tool")
-    st.markdown("**Based on Indian Standards (IS 7098 Part 1) - XLPE Armoured Cables**")
+    st.markdown(_HEADER_MD)
+    
+    # Report timestamp, set once per session rather than on every rerun
+    if "session_ts" not in st.session_state:
+        st.session_state.session_ts = datetime.now().strftime('%d-%m-%Y_%H%M%S')
     
     # ========================================================================
     # SIDEBAR - Input Parameters
@@ -322,269 +420,263 @@ def main():
     with st.sidebar:
         st.header("📋 Input Parameters")
         
-        # System Voltage
-        st.subheader("System Configuration")
-        voltage_phase = st.radio(
-            "System Voltage",
-            options=["1-Phase (230V)", "3-Phase (415V)"],
-            index=1,
-            help="Select single-phase or three-phase system",
-            key="voltage_radio"
-        )
-        voltage = 230 if "1-Phase" in voltage_phase else 415
-        
-        # Load Type
-        st.subheader("Load Details")
+        # Load Type (outside the form: it decides which load inputs are shown)
         load_type = st.radio(
             "Load Type",
-            options=["kW", "HP", "Amps"],
+            options=_LOAD_TYPE_OPTS,
             index=0,
             help="Select the unit of load",
             key="load_type_radio"
         )
         
-        # Load Value
-        load_value = st.number_input(
-            f"Load Value ({load_type})",
-            min_value=0.1,
-            value=10.0,
-            step=0.5,
-            help=f"Enter the load in {load_type}",
-            key="load_value_input"
-        )
-        
-        # Power Factor (for kW and HP)
-        if load_type in ["kW", "HP"]:
-            power_factor = st.slider(
-                "Power Factor",
-                min_value=0.70,
+        # Widgets inside a form only trigger a rerun when the form is submitted
+        with st.form("cable_inputs"):
+            # System Voltage
+            st.subheader("System Configuration")
+            voltage_phase = st.radio(
+                "System Voltage",
+                options=_VOLTAGE_OPTS,
+                index=1,
+                help="Select single-phase or three-phase system",
+                key="voltage_radio"
+            )
+            voltage = 230 if "1-Phase" in voltage_phase else 415
+            
+            # Load Value
+            st.subheader("Load Details")
+            load_value = st.number_input(
+                f"Load Value ({load_type})",
+                min_value=0.1,
+                value=10.0,
+                step=0.5,
+                help=f"Enter the load in {load_type}",
+                key="load_value_input"
+            )
+            
+            # Power Factor (for kW and HP)
+            if load_type in ["kW", "HP"]:
+                power_factor = st.slider(
+                    "Power Factor",
+                    min_value=0.70,
+                    max_value=1.0,
+                    value=0.9,
+                    step=0.05,
+                    help="Power factor of the load (0.70 to 1.0)",
+                    key="pf_slider"
+                )
+            else:
+                power_factor = 1.0
+            
+            st.divider()
+            
+            # Cable Configuration
+            st.subheader("Cable Configuration")
+            conductor_type = st.selectbox(
+                "Conductor Material",
+                options=_CONDUCTOR_OPTS,
+                index=0,
+                help="Select cable conductor material",
+                key="conductor_select"
+            )
+            conductor = "Cu" if "Copper" in conductor_type else "Al"
+            
+            installation_method = st.selectbox(
+                "Installation Method",
+                options=_METHOD_OPTS,
+                index=0,
+                help="Select the cable installation method",
+                key="method_select"
+            )
+            method = _METHOD_MAP[installation_method]
+            
+            st.divider()
+            
+            # Cable Length and Voltage Drop
+            st.subheader("Cable Route & Limits")
+            cable_length = st.number_input(
+                "Cable Length (meters)",
+                min_value=1,
+                value=100,
+                step=5,
+                help="Total length of the cable run",
+                key="cable_length_input"
+            )
+            
+            max_voltage_drop = st.slider(
+                "Max Voltage Drop %",
+                min_value=1.0,
+                max_value=5.0,
+                value=3.0,
+                step=0.5,
+                help="Maximum allowable voltage drop (typically 3%)",
+                key="max_vd_slider"
+            )
+            
+            st.divider()
+            
+            # Derating Factors
+            st.subheader("Derating Factors")
+            temperature_factor = st.slider(
+                "Temperature Derating Factor",
+                min_value=0.50,
                 max_value=1.0,
-                value=0.9,
+                value=0.8,
                 step=0.05,
-                help="Power factor of the load (0.70 to 1.0)",
-                key="pf_slider"
+                help="Derating factor for ambient temperature",
+                key="temp_derating_slider"
             )
-        else:
-            power_factor = 1.0
-        
-        st.divider()
+            
+            grouping_factor = st.slider(
+                "Grouping Factor",
+                min_value=0.50,
+                max_value=1.0,
+                value=1.0,
+                step=0.05,
+                help="Derating factor for cable grouping",
+                key="grouping_slider"
+            )
+            
+            st.form_submit_button("Calculate", use_container_width=True)
         
-        # Cable Configuration
-        st.subheader("Cable Configuration")
-        conductor_type = st.selectbox(
-            "Conductor Material",
-            options=["Copper (Cu)", "Aluminium (Al)"],
-            index=0,
-            help="Select cable conductor material",
-            key="conductor_select"
+        # Combined derating factor (reflects the submitted values)
+        total_derating = temperature_factor * grouping_factor
+        st.info(f"**Combined Derating Factor (applied)**: {total_derating:.2f}")
+    
+    # ========================================================================
+    # MAIN AREA - Results
+    # ========================================================================
+    
+    # Calculate Full Load Current
+    flc = calculate_current(load_value, load_type, voltage, power_factor)
+    
+    # Display Results
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric(
+            label="System Voltage",
+            value=_VOLTAGE_LABEL[voltage],
+            delta=_PHASE_LABEL[voltage]
         )
-        conductor = "Cu" if "Copper" in conductor_type else "Al"
-        
-        installation_method = st.selectbox(
-            "Installation Method",
-            options=["Ground", "Free Air", "Pipe/Duct"],
-            index=0,
-            help="Select the cable installation method",
-            key="method_select"
+    
+    with col2:
+        st.metric(
+            label="Load Value",
+            value=f"{load_value} {load_type}"
         )
-        method_map = {"Ground": "ground", "Free Air": "free_air", "Pipe/Duct": "pipe_duct"}
-        method = method_map[installation_method]
-        
-        st.divider()
-        
-        # Cable Length and Voltage Drop
-        st.subheader("Cable Route & Limits")
-        cable_length = st.number_input(
-            "Cable Length (meters)",
-            min_value=1,
-            value=100,
-            step=5,
-            help="Total length of the cable run",
-            key="cable_length_input"
+    
+    with col3:
+        st.metric(
+            label="Full Load Current",
+            value=f"{flc:.2f} A",
+            delta="Calculated"
         )
+    
+    st.divider()
+    
+    # Select Cable
+    cable_result = select_cable(
+        calculated_current=flc,
+        conductor_type=conductor,
+        installation_method=method,
+        length=cable_length,
+        derating_factor=total_derating,
+        max_voltage_drop_percent=max_voltage_drop,
+        voltage=voltage
+    )
+    
+    # Display Recommended Cable Size
+    if cable_result.status == 'Selected':
+        st.markdown("### 🎯 Recommended Cable Size")
         
-        max_voltage_drop = st.slider(
-            "Max Voltage Drop %",
-            min_value=1.0,
-            max_value=5.0,
-            value=3.0,
-            step=0.5,
-            help="Maximum allowable voltage drop (typically 3%)",
-            key="max_vd_slider"
-        )
+        # Large green box with cable size
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            st.success(f"### {cable_result.size} mm²")
         
         st.divider()
         
-        # Derating Factors
-        st.subheader("Derating Factors")
-        temperature_factor = st.slider(
-            "Temperature Derating Factor",
-            min_value=0.50,
-            max_value=1.0,
-            value=0.8,
-            step=0.05,
-            help="Derating factor for ambient temperature",
-            key="temp_derating_slider"
-        )
+        # Cable Details Table
+        st.markdown("### 📊 Cable Specifications")
         
-        grouping_factor = st.slider(
-            "Grouping Factor",
-            min_value=0.50,
-            max_value=1.0,
-            value=1.0,
-            step=0.05,
-            help="Derating factor for cable grouping",
-            key="grouping_slider"
-        )
+        table_data = {
+            "Parameter": _SPEC_PARAMETERS,
+            "Value": [
+                f"{COPPER_CURRENT_RATINGS[cable_result.size][method] if conductor == 'Cu' else ALUMINIUM_CURRENT_RATINGS[cable_result.size][method]} A",
+                f"{total_derating:.2f}",
+                f"{cable_result.actual_capacity:.2f} A",
+                f"{flc:.2f} A",
+                f"{cable_result.actual_capacity - flc:.2f} A ({((cable_result.actual_capacity - flc) / flc * 100):.1f}%)",
+                f"{cable_result.voltage_drop:.2f} %",
+                f"{cable_result.voltage_drop_mv:.3f} mV/m"
+            ]
+        }
         
-        # Combined derating factor
-        total_derating = temperature_factor * grouping_factor
-        st.info(f"**Combined Derating Factor**: {total_derating:.2f}")
-    
-    # ========================================================================
-    # MAIN AREA - Results
-    # ========================================================================
-    
-    # Calculate Full Load Current
-    try:
-        flc = calculate_current(load_value, load_type, voltage, power_factor)
-        
-        # Display Results
-        col1, col2, col3 = st.columns(3)
+        st.table(table_data, hide_index=True)
         
-        with col1:
-            st.metric(
-                label="System Voltage",
-                value=f"{voltage}V",
-                delta="3-Phase" if voltage == 415 else "Single-Phase"
+        # Voltage Drop Warning
+        if cable_result.voltage_drop > 3.0:
+            st.warning(
+                f"⚠️ **Voltage Drop Alert**: The voltage drop is {cable_result.voltage_drop:.2f}%, "
+                f"which exceeds the recommended limit of 3%. "
+                f"Consider using a larger cable size or reducing cable length."
             )
-        
-        with col2:
-            st.metric(
-                label="Load Value",
-                value=f"{load_value} {load_type}"
+        else:
+            st.info(
+                f"✅ **Voltage Drop OK**: {cable_result.voltage_drop:.2f}% is within "
+                f"the acceptable limit of {max_voltage_drop}%"
             )
         
-        with col3:
-            st.metric(
-                label="Full Load Current",
-                value=f"{flc} A",
-                delta="Calculated"
-            )
+        st.divider()
+        
+        # Summary Box
+        st.markdown("### 📋 Summary")
+        summary_col1, summary_col2, summary_col3 = st.columns(3)
+        
+        with summary_col1:
+            st.metric("Cable Size", f"{cable_result.size} mm²")
+        
+        with summary_col2:
+            st.metric("Actual Capacity", f"{cable_result.actual_capacity:.2f} A")
+        
+        with summary_col3:
+            st.metric("Voltage Drop", f"{cable_result.voltage_drop:.2f} %")
         
         st.divider()
         
-        # Select Cable
-        cable_result = select_cable(
-            calculated_current=flc,
-            conductor_type=conductor,
-            installation_method=method,
-            length=cable_length,
-            derating_factor=total_derating,
-            max_voltage_drop_percent=max_voltage_drop,
-            voltage=voltage
-        )
+        # Download Report Button
+        st.markdown("### 📥 Download Report")
         
-        # Display Recommended Cable Size
-        if cable_result['status'] == 'Selected':
-            st.markdown("### 🎯 Recommended Cable Size")
-            
-            # Large green box with cable size
-            col1, col2, col3 = st.columns([1, 2, 1])
-            with col2:
-                st.success(f"### {cable_result['size']} mm²")
-            
-            st.divider()
-            
-            # Cable Details Table
-            st.markdown("### 📊 Cable Specifications")
-            
-            table_data = {
-                "Parameter": [
-                    "Base Rating (from IS 7098)",
-                    "Derating Factor",
-                    "Actual Capacity",
-                    "Load Current",
-                    "Safety Margin",
-                    "Voltage Drop",
-                    "Voltage Drop (mV/m)"
-                ],
-                "Value": [
-                    f"{COPPER_CURRENT_RATINGS[cable_result['size']][method] if conductor == 'Cu' else ALUMINIUM_CURRENT_RATINGS[cable_result['size']][method]} A",
-                    f"{total_derating:.2f}",
-                    f"{cable_result['actual_capacity']} A",
-                    f"{flc} A",
-                    f"{cable_result['actual_capacity'] - flc:.2f} A ({((cable_result['actual_capacity'] - flc) / flc * 100):.1f}%)",
-                    f"{cable_result['voltage_drop']} %",
-                    f"{cable_result['voltage_drop_mv']} mV/m"
-                ]
-            }
-            
-            st.dataframe(table_data, use_container_width=True, hide_index=True)
-            
-            # Voltage Drop Warning
-            if cable_result['voltage_drop'] > 3.0:
-                st.warning(
-                    f"⚠️ **Voltage Drop Alert**: The voltage drop is {cable_result['voltage_drop']}%, "
-                    f"which exceeds the recommended limit of 3%. "
-                    f"Consider using a larger cable size or reducing cable length."
-                )
-            else:
-                st.info(
-                    f"✅ **Voltage Drop OK**: {cable_result['voltage_drop']}% is within "
-                    f"the acceptable limit of {max_voltage_drop}%"
-                )
-            
-            st.divider()
-            
-            # Summary Box
-            st.markdown("### 📋 Summary")
-            summary_col1, summary_col2, summary_col3 = st.columns(3)
-            
-            with summary_col1:
-                st.metric("Cable Size", f"{cable_result['size']} mm²")
-            
-            with summary_col2:
-                st.metric("Actual Capacity", f"{cable_result['actual_capacity']} A")
-            
-            with summary_col3:
-                st.metric("Voltage Drop", f"{cable_result['voltage_drop']} %")
-            
-            st.divider()
-            
-            # Download Report Button
-            st.markdown("### 📥 Download Report")
-            
+        try:
             pdf_data = generate_pdf(
-                cable_result['size'], 
+                cable_result.size, 
                 flc, 
-                cable_result['voltage_drop'], 
+                cable_result.voltage_drop, 
                 load_value, 
                 voltage, 
                 conductor_type,
                 installation_method
             )
-            
+        except (UnicodeEncodeError, OSError) as e:
+            st.error(f"Could not generate PDF report: {str(e)}")
+        else:
             st.download_button(
                 label="📄 Download PDF Report",
                 data=pdf_data,
-                file_name=f"Cable_Sizing_Report_{datetime.now().strftime('%d-%m-%Y_%H%M%S')}.pdf",
+                file_name=f"Cable_Sizing_Report_{st.session_state.session_ts}.pdf",
                 mime="application/pdf",
                 use_container_width=True
             )
-        
-        else:
-            st.error(f"❌ {cable_result['status']}")
-            st.info(
-                "Try one of the following:\n"
-                "- Reduce the load\n"
-                "- Reduce the cable length\n"
-                "- Increase the maximum voltage drop limit\n"
-                "- Reduce the derating factors"
-            )
-        
-    except Exception as e:
-        st.error(f"Error in calculation: {str(e)}")
+    
+    else:
+        st.error(f"❌ {cable_result.status}")
+        st.info(
+            "Try one of the following:\n"
+            "- Reduce the load\n"
+            "- Reduce the cable length\n"
+            "- Increase the maximum voltage drop limit\n"
+            "- Reduce the derating factors"
+        )
 
 
 if __name__ == "__main__":